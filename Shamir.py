@@ -1,32 +1,74 @@
 import random
+from itertools import accumulate
+from math import isqrt
 from typing import List, Tuple
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    from numba import njit    # Compilation JIT des boucles arithmétiques (optionnelle)
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):    # Sans Numba, les noyaux restent de simples fonctions Python
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # Utiliser un grand nombre premier comme champ fini
 PRIME = 2089  # doit être > secret et > n
 
-def isprime(n: int) -> bool:  # Renvoie True si n est un nombre premier, False sinon.    
-    if n <= 1:
-        return False
-    if n <= 3:
-        return True
-    if n % 2 == 0 or n % 3 == 0:
-        return False
+# Crible d'Ératosthène calculé une seule fois à l'import
+_SIEVE_LIMIT = 1 << 16
+_SIEVE = bytearray([1]) * _SIEVE_LIMIT
+_SIEVE[0] = _SIEVE[1] = 0
+for _i in range(2, isqrt(_SIEVE_LIMIT - 1) + 1):
+    if _SIEVE[_i]:
+        _SIEVE[_i * _i::_i] = bytes(len(range(_i * _i, _SIEVE_LIMIT, _i)))
+_SMALL_PRIMES = [i for i, is_p in enumerate(_SIEVE) if is_p]
 
-    i = 5
-    while i * i <= n:
+def isprime(n: int) -> bool:  # Renvoie True si n est un nombre premier, False sinon.
+    if n < _SIEVE_LIMIT:
+        return n >= 0 and bool(_SIEVE[n])
+    root = isqrt(n)
+    for p in _SMALL_PRIMES:
+        if p > root:
+            return True
+        if n % p == 0:
+            return False
+    # Au-delà de 2^32, on poursuit par la roue 6k ± 1
+    i = _SMALL_PRIMES[-1] + 2
+    i += (5 - i) % 6
+    while i <= root:
         if n % i == 0 or n % (i + 2) == 0:
             return False
         i += 6
     return True
 
-def generate_polynomial(secret: int, degree: int) -> List[int]:            # Génère un polynôme aléatoire f(x) = a0 + a1*x + ... + at-1*x^t-1
-    return [secret] + [random.randint(0, PRIME - 1) for _ in range(degree)]
+def generate_polynomial(secret: int, degree: int) -> np.ndarray:            # Génère un polynôme aléatoire f(x) = a0 + a1*x + ... + at-1*x^t-1 (tableau int64)
+    bits = PRIME.bit_length()
+    mask = (1 << bits) - 1
+    poly = np.empty(degree + 1, dtype=np.int64)
+    poly[0] = secret
+    filled = 1
+    while filled <= degree:
+        # Un seul tirage pour tous les coefficients restants (deux fois plus de bits pour le rejet)
+        draws = 2 * (degree + 1 - filled)
+        r = random.getrandbits(bits * draws)
+        for _ in range(draws):
+            coeff = r & mask
+            r >>= bits
+            if coeff < PRIME:    # Rejet des valeurs hors du champ pour garder une loi uniforme
+                poly[filled] = coeff
+                filled += 1
+                if filled > degree:
+                    break
+    return poly
 
-def print_polynomial(poly: List[int]):        # Affiche le polynôme sous forme mathématique : f(x) = a0 + a1·x + a2·x² + ...
+def print_polynomial(poly: np.ndarray):        # Affiche le polynôme sous forme mathématique : f(x) = a0 + a1·x + a2·x² + ...
     terms = []
-    for power, coeff in enumerate(poly):
+    for power, coeff in enumerate(np.asarray(poly).tolist()):
         if coeff == 0:
             continue
         if power == 0:
@@ -39,12 +81,91 @@ def print_polynomial(poly: List[int]):        # Affiche le polynôme sous forme
     print(f"f(x) = {polynomial_str}\n")
 
 
-def evaluate_polynomial(poly: List[int], x: int, prime: int = PRIME) -> int:    # Évalue le polynôme en un point x modulo prime.
-    return sum(coef * pow(x, i, prime) for i, coef in enumerate(poly)) % prime
+def _as_int64(values):    # Tableau int64 (sans copie) pour les noyaux compilés, liste Python sinon
+    if NUMBA_AVAILABLE:
+        return np.asarray(values, dtype=np.int64)
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
+@njit(cache=True)
+def _pow_mod(base, exp, prime):    # Exponentiation modulaire rapide (utilisable dans les noyaux compilés)
+    result = 1
+    base %= prime
+    while exp > 0:
+        if exp & 1:
+            result = result * base % prime
+        base = base * base % prime
+        exp >>= 1
+    return result
+
+@njit(cache=True)
+def _horner(poly, x, prime):    # Noyau de Horner : coefficients du plus haut degré au plus bas
+    result = 0
+    for i in range(len(poly) - 1, -1, -1):
+        result = (result * x + poly[i]) % prime
+    return result
+
+# Réduction de Barrett : pour prime < 2^16, « v % prime » (une division) devient deux multiplications et un décalage
+BARRETT_SHIFT = 32
+
+def _barrett_factor(prime: int) -> int:    # m = 2^32 // prime, ou 0 si prime est trop grand pour la réduction de Barrett
+    return (1 << BARRETT_SHIFT) // prime if prime < 1 << 16 else 0
+
+@njit(cache=True)
+def _barrett_reduce(v, prime, m):    # v mod prime pour 0 <= v < 2^32
+    r = v - ((v * m) >> BARRETT_SHIFT) * prime
+    if r >= prime:
+        r -= prime
+    return r
 
-def plot_polynomial(poly: List[int], prime: int = PRIME, x_range: Tuple[int, int] = (-50, 50)) -> None:         # Trace la courbe du polynôme sur une plage de valeurs de x.
-    x_vals = list(range(*x_range))
-    y_vals = [evaluate_polynomial(poly, x, prime) for x in x_vals]
+@njit(cache=True)
+def _eval_shares(poly, n, prime, m):    # Noyau fusionné : Horner pour x = 1..n en une seule double boucle compilée
+    out = np.empty(n, dtype=np.int64)
+    if m == 0:
+        for x in range(1, n + 1):
+            out[x - 1] = _horner(poly, x, prime)
+        return out
+    for x in range(1, n + 1):    # coefficients et x déjà réduits : res * x + c < prime²
+        xr = x % prime
+        res = 0
+        for i in range(len(poly) - 1, -1, -1):
+            res = _barrett_reduce(res * xr + poly[i], prime, m)
+        out[x - 1] = res
+    return out
+
+def evaluate_polynomial(poly: np.ndarray, x: int, prime: int = PRIME) -> int:    # Évalue le polynôme en un point x modulo prime (méthode de Horner).
+    coeffs = [c % prime for c in np.asarray(poly).tolist()]
+    x %= prime
+    if prime >= 1 << 31:    # prime² ne tient plus sur 64 bits : Horner en entiers Python
+        result = 0
+        for coeff in reversed(coeffs):
+            result = (result * x + coeff) % prime
+        return result
+    return int(_horner(_as_int64(coeffs), x, prime))
+
+def evaluate_polynomial_array(poly: np.ndarray, xs: np.ndarray, prime: int = PRIME) -> np.ndarray:    # Évalue le polynôme en tous les points de xs à la fois (Horner vectorisé NumPy).
+    m = _barrett_factor(prime)
+    coeffs = np.asarray(poly, dtype=np.int64) % prime
+    xs = np.asarray(xs, dtype=np.int64) % prime
+    res = np.zeros(len(xs), dtype=np.int64)
+    for coeff in coeffs[::-1]:
+        res = res * xs + coeff
+        if m:
+            res -= ((res * m) >> BARRETT_SHIFT) * prime
+            res -= prime * (res >= prime)
+        else:
+            res %= prime
+    return res
+
+def power_table(xs: np.ndarray, t: int, prime: int = PRIME) -> np.ndarray:    # Matrice des puissances xs[i]^k mod prime pour k = 0..t-1 (récurrence, sans pow)
+    xpow = np.ones((len(xs), t), dtype=np.int64)
+    xs = np.asarray(xs, dtype=np.int64) % prime
+    for k in range(1, t):
+        xpow[:, k] = xpow[:, k - 1] * xs % prime
+    return xpow
+
+def plot_polynomial(poly: np.ndarray, prime: int = PRIME, x_range: Tuple[int, int] = (-50, 50)) -> None:         # Trace la courbe du polynôme sur une plage de valeurs de x.
+    x_vals = np.arange(*x_range, dtype=np.int64)
+    y_vals = evaluate_polynomial_array(poly, x_vals, prime)
 
     plt.figure(figsize=(8, 5))
     plt.plot(x_vals, y_vals, marker='o')
@@ -54,12 +175,15 @@ def plot_polynomial(poly: List[int], prime: int = PRIME, x_range: Tuple[int, int
     plt.grid(True)
     plt.show()
 
-def evaluate_polynomial_real(poly: List[int], x: float) -> float:  # Évalue le polynôme en un point x sans modulo (dans ℝ).
-    return sum(coef * (x ** i) for i, coef in enumerate(poly))
+def evaluate_polynomial_real(poly: np.ndarray, x: float) -> float:  # Évalue le polynôme en un point x sans modulo (dans ℝ), méthode de Horner.
+    result = 0.0
+    for coeff in reversed(poly):
+        result = result * x + coeff
+    return result
 
-def plot_polynomial_real(poly: List[int], x_range: Tuple[float, float] = (-50, 50), num_points: int = 200) -> None:   # Trace la courbe du polynôme sur une plage de valeurs de x sans modulo (dans ℝ).
+def plot_polynomial_real(poly: np.ndarray, x_range: Tuple[float, float] = (-50, 50), num_points: int = 200) -> None:   # Trace la courbe du polynôme sur une plage de valeurs de x sans modulo (dans ℝ).
     x_vals = np.linspace(*x_range, num_points)
-    y_vals = [evaluate_polynomial_real(poly, x) for x in x_vals]
+    y_vals = np.polynomial.polynomial.polyval(x_vals, poly)    # Horner vectorisé sur tout x_vals
 
     plt.figure(figsize=(8, 5))
     plt.plot(x_vals, y_vals)
@@ -70,30 +194,118 @@ def plot_polynomial_real(poly: List[int], x_range: Tuple[float, float] = (-50, 5
     plt.show()
 
 
-def generate_shares(secret: int, n: int, t: int) -> Tuple[List[Tuple[int, int]], List[int]]:    # Génère n parts avec un seuil de t, retourne aussi le polynôme
+def generate_shares(secret: int, n: int, t: int) -> Tuple[List[Tuple[int, int]], np.ndarray]:    # Génère n parts avec un seuil de t, retourne aussi le polynôme
     poly = generate_polynomial(secret, t - 1)
-    shares = [(i, evaluate_polynomial(poly, i)) for i in range(1, n + 1)]
+    if NUMBA_AVAILABLE:
+        ys = _eval_shares(poly % PRIME, n, PRIME, _barrett_factor(PRIME))
+    else:
+        # Table des puissances xpow[i][k] = (i+1)^k mod PRIME puis un seul produit matriciel
+        xpow = power_table(np.arange(1, n + 1, dtype=np.int64), len(poly))
+        ys = (xpow @ (poly % PRIME)) % PRIME
+    shares = list(zip(range(1, n + 1), ys.tolist()))
     return shares, poly
 
 
+@njit(cache=True)
+def _batch_inverse(values, prime):    # Astuce de Montgomery : produits préfixes, une seule inversion, remontée
+    k = len(values)
+    prefix = [1] * k
+    acc = 1
+    for m in range(k):
+        acc = acc * values[m] % prime
+        prefix[m] = acc
+    if acc == 0:    # Une valeur nulle modulo prime annule tout le produit : aucun inverse n'existe
+        raise ValueError("valeur non inversible modulo prime")
+    inv_acc = _pow_mod(acc, prime - 2, prime)    # Petit théorème de Fermat
+    inverses = [0] * k
+    for m in range(k - 1, 0, -1):
+        inverses[m] = inv_acc * prefix[m - 1] % prime
+        inv_acc = inv_acc * values[m] % prime
+    if k > 0:
+        inverses[0] = inv_acc
+    return inverses
+
+def batch_inverse(values: List[int], prime: int = PRIME) -> List[int]:    # Inverse tous les éléments modulo prime avec une seule exponentiation
+    if not values:
+        return []
+    values = [int(v) % prime for v in values]    # Réduites d'abord : acc * values[m] reste sous prime²
+    if prime >= 1 << 31:    # prime² ne tient plus sur 64 bits : même astuce en entiers Python
+        prefix = list(accumulate(values, lambda a, v: a * v % prime))
+        if prefix[-1] == 0:
+            raise ValueError("valeur non inversible modulo prime")
+        inv_acc = pow(prefix[-1], prime - 2, prime)
+        inverses = [0] * len(values)
+        for m in range(len(values) - 1, 0, -1):
+            inverses[m] = inv_acc * prefix[m - 1] % prime
+            inv_acc = inv_acc * values[m] % prime
+        inverses[0] = inv_acc
+        return inverses
+    return [int(v) for v in _batch_inverse(_as_int64(values), prime)]
+
+
 def lagrange_interpolation(x: int, x_s: List[int], y_s: List[int]) -> int:     # Interpolation de Lagrange pour retrouver le secret f(0)
+    k = len(x_s)
+    # Tables calculées une seule fois : x - xj et xi - xj (diagonale à 1 pour le produit)
+    neg = [(x - xj) % PRIME for xj in x_s]
+    diff = [[(x_s[i] - x_s[j]) % PRIME if i != j else 1 for j in range(k)] for i in range(k)]
+    dens = []
+    for row in diff:
+        den = 1
+        for d in row:
+            den = den * d % PRIME
+        dens.append(den)
+    inv_dens = batch_inverse(dens)    # k dénominateurs inversés avec une seule exponentiation
+
     total = 0
+    for i in range(k):
+        li = inv_dens[i]
+        for j in range(k):
+            if i != j:
+                li = li * neg[j] % PRIME
+        total = (total + y_s[i] * li) % PRIME
+    return total
+
+@njit(cache=True)
+def _lagrange_at_zero(x_s, y_s, prime):    # Noyau : f(0) = Σ yi · ∏(-xj) / ∏(xi - xj)
     k = len(x_s)
+    # ∏_{j≠i} (-xj) par produits préfixes / suffixes, sans division
+    suffix = [1] * (k + 1)
+    for j in range(k - 1, -1, -1):
+        suffix[j] = suffix[j + 1] * ((-x_s[j]) % prime) % prime
+    nums = [1] * k
+    prefix = 1
     for i in range(k):
-        xi, yi = x_s[i], y_s[i]
-        li = 1
+        nums[i] = prefix * suffix[i + 1] % prime
+        prefix = prefix * ((-x_s[i]) % prime) % prime
+
+    dens = [1] * k
+    for i in range(k):
+        den = 1
         for j in range(k):
             if i != j:
-                xj = x_s[j]
-                li *= (x - xj) * pow(xi - xj, -1, PRIME)
-                li %= PRIME
-        total += yi * li
-        total %= PRIME
+                den = den * ((x_s[i] - x_s[j]) % prime) % prime
+        dens[i] = den
+    inv_dens = _batch_inverse(dens, prime)    # k inversions regroupées en une seule exponentiation
+
+    total = 0
+    for i in range(k):
+        total = (total + y_s[i] * nums[i] % prime * inv_dens[i]) % prime
     return total
 
+def lagrange_at_zero(x_s: List[int], y_s: List[int]) -> int:     # Interpolation de Lagrange directement en x = 0
+    # Abscisses et valeurs réduites modulo PRIME : les produits du noyau restent sur 64 bits
+    x_s = [int(x) % PRIME for x in x_s]
+    y_s = [int(y) % PRIME for y in y_s]
+    return int(_lagrange_at_zero(_as_int64(x_s), _as_int64(y_s), PRIME))
+
+def shares_to_soa(shares: List[Tuple[int, int]]) -> Tuple[List[int], List[int]]:   # Sépare les parts (x, y) en deux listes parallèles xs et ys
+    return [x for x, _ in shares], [y for _, y in shares]
+
 def reconstruct_secret(shares: List[Tuple[int, int]]) -> int:   # Reconstitue le secret à partir d'au moins t parts
-    x_s, y_s = zip(*shares)
-    return lagrange_interpolation(0, list(x_s), list(y_s))
+    x_s, y_s = shares_to_soa(shares)
+    if len({x % PRIME for x in x_s}) != len(x_s):    # Parts dupliquées : l'interpolation n'est pas définie
+        raise ValueError("les abscisses des parts doivent être distinctes modulo PRIME")
+    return lagrange_at_zero(x_s, y_s)
 
 # Exemple d'utilisation
 def main():
@@ -116,8 +328,7 @@ def main():
     print_polynomial(poly)
     
     print("\nParts générées (à distribuer aux participants) :")
-    for i, (x, y) in enumerate(shares, 1):
-        print(f"Participant {i} reçoit : (x={x}, y={y})")
+    print("\n".join(f"Participant {i} reçoit : (x={x}, y={y})" for i, (x, y) in enumerate(shares, 1)))
     
     # Affichage de la courbe
     plot_polynomial(poly)  
@@ -126,8 +337,7 @@ def main():
     
     selected_shares = random.sample(shares, t)
     print("\nReconstruction avec les parts suivantes :")
-    for x, y in selected_shares:
-        print(f"(x={x}, y={y})")
+    print("\n".join(f"(x={x}, y={y})" for x, y in selected_shares))
     
     recovered_secret = reconstruct_secret(selected_shares)
     print(f"\nSecret reconstruit : {recovered_secret}")
@@ -0,0 +1,363 @@
+import math
+import numpy as np
+from secrets import randbelow, token_bytes
+from typing import Optional
+
+try:
+    import gmpy2  # Exponentiation modulaire GMP (optionnelle)
+except ImportError:
+    gmpy2 = None
+
+try:
+    from numba import njit, prange  # Compilation JIT des noyaux numériques (optionnelle, partagée par les scripts)
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):  # Sans Numba, le noyau reste une simple fonction Python
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+PROD_FOLD_MAX_BITS = 1024  # Au-delà, le produit complet devient plus coûteux que les réductions pas à pas
+FIXED_BASE_MIN_BITS = 256  # En dessous, pow/gmpy2 reste plus rapide que la table fenêtrée
+FIXED_BASE_WINDOW = 4  # Fenêtre de 4 bits : 15 puissances précalculées par chiffre hexadécimal
+
+SPECIAL_FORM_MIN_BITS = 512  # p = 2^k - c : réduction par décalage + addition, rentable sans GMP dès 512 bits
+SPECIAL_FORM_MAX_C = 1 << 16
+SPECIAL_WINDOW = 5  # Fenêtre glissante de l'exponentiation à réduction spéciale
+
+MONT_BITS = 16  # R = 2^16 : produits sur 32 bits pour p < 2^16
+MONT_MASK = (1 << MONT_BITS) - 1
+
+
+def _mont_params(p):
+    """(n_inv, R² mod p) pour la forme de Montgomery, (0, 0) si p pair ou trop grand"""
+    if p % 2 == 0 or p >= 1 << MONT_BITS:
+        return 0, 0
+    R = 1 << MONT_BITS
+    return (-pow(p, -1, R)) % R, R * R % p
+
+
+@njit(cache=True)
+def _mont_reduce(t, p, n_inv):
+    """t × R^-1 mod p sans division : un produit masqué et un décalage"""
+    m = ((t & MONT_MASK) * n_inv) & MONT_MASK
+    u = (t + m * p) >> MONT_BITS
+    if u >= p:
+        u -= p
+    return u
+
+
+@njit(cache=True)
+def mont_modexp_kernel(b, e, p, n_inv, r2):
+    """b^e mod p par square-and-multiply en forme de Montgomery (p impair < 2^16)"""
+    bm = _mont_reduce((b % p) * r2, p, n_inv)
+    rm = _mont_reduce(r2, p, n_inv)  # 1 en forme de Montgomery
+    while e > 0:
+        if e & 1:
+            rm = _mont_reduce(rm * bm, p, n_inv)
+        e >>= 1
+        bm = _mont_reduce(bm * bm, p, n_inv)
+    return _mont_reduce(rm, p, n_inv)
+
+
+@njit(cache=True)
+def modexp_kernel(b, e, p):
+    """b^e mod p par square-and-multiply, réduit à chaque étape pour rester sous p²"""
+    r = 1
+    b %= p
+    while e > 0:
+        if e & 1:
+            r = r * b % p
+        e >>= 1
+        b = b * b % p
+    return r
+
+
+@njit(parallel=True, cache=True)
+def _batch_modexp(base, exps, p):
+    """base^exps[i] mod p pour toutes les clés, réparti sur les cœurs"""
+    out = np.empty_like(exps)
+    for i in prange(exps.shape[0]):
+        out[i] = modexp_kernel(base, exps[i], p)
+    return out
+
+
+@njit(cache=True)
+def _fold_exponents(keys, order):
+    """Produit des clés mod order (entiers 64 bits : order < 2^31)"""
+    e = 1
+    for k in keys:
+        e = e * k % order
+    return e
+
+
+class DiffieHellman:
+    """
+    Implémentation du protocole Diffie-Hellman, partagée par tous les scripts
+    """
+    __slots__ = ('p', 'g', '_p_mpz', '_g_mpz', 'exp_table', 'log_table', 'exp_np', 'log_np', '_g_windows',
+                 'mont', '_special')
+    VERBOSE = False  # Affichage par défaut quand verbose n'est pas précisé
+    # Premiers de forme spéciale (Mersenne / pseudo-Mersenne) : réduction rapide sans division
+    SPECIAL_PRIMES = {'2^521 - 1': 2 ** 521 - 1, '2^1279 - 1': 2 ** 1279 - 1, '2^2203 - 1': 2 ** 2203 - 1}
+    
+    def __init__(self, p: Optional[int] = None, g: Optional[int] = None, verbose: Optional[bool] = None):
+        self.p = 2357 if p is None else p  # Nombre premier
+        self.g = 2 if g is None else g     # Générateur primitif modulo p
+        
+        self._p_mpz = gmpy2.mpz(self.p) if gmpy2 is not None else self.p
+        self._g_mpz = gmpy2.mpz(self.g) if gmpy2 is not None else self.g
+        self.exp_table, self.log_table = self._build_tables()
+        # Copies NumPy des tables, construites une fois et partagées par les calculs vectorisés
+        if self.exp_table is not None:
+            self.exp_np = np.asarray(self.exp_table, dtype=np.int64)
+            self.log_np = np.asarray(self.log_table, dtype=np.int64)
+        else:
+            self.exp_np = self.log_np = None
+        self._g_windows = self._build_g_windows()
+        self.mont = _mont_params(self.p)  # Constantes de Montgomery précalculées une fois
+        self._special = self._special_form()
+        
+        if self.VERBOSE if verbose is None else verbose:
+            print(f"Paramètres publics:")
+            print(f"p = {self.p}, g = {self.g}\n")
+    
+    def _build_tables(self):
+        """
+        Tables g^k mod p et logarithme discret (p petit, g générateur)
+        """
+        if self.p >= 1 << 20:
+            return None, None
+        order = self.p - 1
+        exp_table = [1] * order
+        log_table = [0] * self.p
+        v = 1
+        for k in range(1, order):
+            v = v * self.g % self.p
+            if v == 1:  # g n'est pas générateur : tables incomplètes
+                return None, None
+            exp_table[k] = v
+            log_table[v] = k
+        return exp_table, log_table
+    
+    def _build_g_windows(self):
+        """
+        Table à base fixe g^(d × 16^i) mod p pour d dans 0..15 (grand p, sans tables exp/log)
+        """
+        if self.exp_table is not None or self.p.bit_length() < FIXED_BASE_MIN_BITS:
+            return None
+        size = 1 << FIXED_BASE_WINDOW
+        windows = []
+        base = self._g_mpz
+        for i in range(-(-(self.p - 1).bit_length() // FIXED_BASE_WINDOW)):
+            row = [base ** 0]
+            for d in range(1, size):
+                row.append(row[-1] * base % self._p_mpz)
+            windows.append(row)
+            base = row[-1] * base % self._p_mpz  # g^(16^(i+1))
+        return windows
+    
+    def _fixed_base_pow(self, exponent: int) -> int:
+        """
+        g^exponent mod p par lecture de table : aucune mise au carré, une multiplication par fenêtre
+        """
+        mask = (1 << FIXED_BASE_WINDOW) - 1
+        p = self._p_mpz
+        r = 1
+        for row in self._g_windows:
+            if not exponent:
+                break
+            d = exponent & mask
+            if d:
+                r = r * row[d] % p
+            exponent >>= FIXED_BASE_WINDOW
+        return int(r)
+    
+    def _special_form(self):
+        """
+        (k, c) si p = 2^k - c avec c petit (Mersenne, pseudo-Mersenne), sinon None
+        """
+        k = self.p.bit_length()
+        c = (1 << k) - self.p
+        if k < SPECIAL_FORM_MIN_BITS or c >= SPECIAL_FORM_MAX_C:
+            return None
+        return k, c
+    
+    def _fast_reduce(self, x: int) -> int:
+        """
+        x mod p pour p = 2^k - c : 2^k ≡ c, donc x = haut × 2^k + bas ≡ haut × c + bas
+        """
+        k, c = self._special
+        mask = (1 << k) - 1
+        while x >> k:
+            x = (x & mask) + c * (x >> k)
+        return x - self.p if x >= self.p else x
+    
+    def _special_pow(self, base: int, exponent: int) -> int:
+        """
+        base^exponent mod p par fenêtre glissante, chaque produit réduit par _fast_reduce
+        """
+        reduce = self._fast_reduce
+        b = base % self.p
+        b2 = reduce(b * b)
+        odd_powers = [b]  # b, b^3, b^5, ..., b^(2^w - 1)
+        for _ in range((1 << (SPECIAL_WINDOW - 1)) - 1):
+            odd_powers.append(reduce(odd_powers[-1] * b2))
+        r = 1
+        i = exponent.bit_length() - 1
+        while i >= 0:
+            if not (exponent >> i) & 1:
+                r = reduce(r * r)
+                i -= 1
+                continue
+            j = max(i - SPECIAL_WINDOW + 1, 0)
+            while not (exponent >> j) & 1:
+                j += 1
+            for _ in range(i - j + 1):
+                r = reduce(r * r)
+            r = reduce(r * odd_powers[((exponent >> j) & ((1 << (i - j + 1)) - 1)) >> 1])
+            i = j - 1
+        return r
+    
+    def modexp(self, base: int, exponent: int) -> int:
+        """
+        base^exponent mod p (noyau compilé si p < 2^31, sinon GMP si gmpy2 est installé)
+        Grands exposants : GMP et pow (CPython 3.11+) balayent déjà l'exposant par fenêtres glissantes,
+        une fenêtre écrite en Python serait plus lente que ces boucles en C
+        """
+        if NUMBA_AVAILABLE and self.p < 1 << 31 and 0 <= exponent < 1 << 63:
+            # Base réduite côté Python : les noyaux n'acceptent que des entiers 64 bits
+            base = int(base) % self.p
+            if self.mont[0]:
+                # Valeurs gardées en forme de Montgomery sur toute la boucle, une seule conversion retour
+                return int(mont_modexp_kernel(base, int(exponent), self.p, *self.mont))
+            # p² tient sur 64 bits : square-and-multiply natif, ~10x plus rapide que pow sur 31 bits
+            return int(modexp_kernel(base, int(exponent), self.p))
+        if gmpy2 is not None:
+            return int(gmpy2.powmod(base, exponent, self._p_mpz))
+        if self._special is not None and exponent >= 0:
+            # Sans GMP, p de forme spéciale : la réduction sans division bat pow (~3x pour 2^2203 - 1)
+            return self._special_pow(int(base), int(exponent))
+        return pow(base, exponent, self.p)
+    
+    def modexp_sec(self, base: int, exponent: int) -> int:
+        """
+        base^exponent mod p en temps constant (GMP powmod_sec : p impair, exposant > 0), sinon modexp
+        """
+        if gmpy2 is not None and self.p & 1 and exponent > 0:
+            return int(gmpy2.powmod_sec(base, exponent, self._p_mpz))
+        return self.modexp(base, exponent)
+    
+    def fast_modexp(self, x: int, k: int) -> int:
+        """
+        x^k mod p = g^(log(x) × k) : deux lectures de table au lieu d'une exponentiation
+        """
+        if self.exp_table is None or x % self.p == 0:
+            return self.modexp(x, k)
+        return self.exp_table[self.log_table[x % self.p] * k % (self.p - 1)]
+    
+    def generate_private_key(self) -> int:
+        """Clé privée dans [2, p-2] tirée par le CSPRNG du système (exclut 0, 1 et p-1)"""
+        return randbelow(self.p - 3) + 2
+    
+    def generate_private_keys(self, count: int) -> Optional[np.ndarray]:
+        """
+        count clés privées dans [2, p-2] tirées par le CSPRNG du système, rangées en tableau int64
+        (None si p dépasse 63 bits)
+        Un seul appel à token_bytes pour tout le lot, puis rejet des valeurs hors intervalle
+        (moins d'une sur deux) : seules celles-ci sont retirées
+        """
+        if self.p >= 1 << 63:
+            return None
+        bound = self.p - 3
+        if bound <= 0:
+            raise ValueError("p trop petit pour tirer des clés privées")
+        bits = max((bound - 1).bit_length(), 1)
+        nbytes = (bits + 7) // 8
+        shifts = np.arange(nbytes, dtype=np.uint64) * np.uint64(8)
+        keys = np.empty(0, dtype=np.int64)
+        while keys.size < count:
+            need = count - keys.size
+            raw = np.frombuffer(token_bytes(need * nbytes), dtype=np.uint8).reshape(need, nbytes)
+            values = np.bitwise_or.reduce(raw.astype(np.uint64) << shifts, axis=1) & np.uint64((1 << bits) - 1)
+            keys = np.concatenate((keys, values[values < bound].astype(np.int64)))
+        return keys + 2
+    
+    def compute_public_keys(self, keys: np.ndarray):
+        """
+        g^keys[i] mod p pour tout un tableau de clés (lecture de table, noyau parallèle ou GMP)
+        """
+        if self.exp_np is not None:
+            return self.exp_np[keys % (self.p - 1)]
+        if NUMBA_AVAILABLE and self.p < 1 << 31:
+            return _batch_modexp(self.g, keys, self.p)
+        return [self.compute_public_key(int(k)) for k in keys]
+    
+    def fold_private_keys(self, keys) -> int:
+        """
+        a1 × a2 × ... × an mod (p-1) : l'ordre de g divise p-1 (Fermat), l'exposant se réduit
+        keys : liste d'entiers ou tableau int64 (tel que renvoyé par generate_private_keys)
+        """
+        order = self.p - 1
+        if NUMBA_AVAILABLE and order < 1 << 31:
+            if not isinstance(keys, np.ndarray):
+                keys = np.array(keys, dtype=np.int64)
+            return int(_fold_exponents(keys, order))
+        if len(keys) * order.bit_length() <= PROD_FOLD_MAX_BITS:
+            # Produit petit : multiplications en C dans math.prod, un seul % à la fin
+            return math.prod(map(int, keys)) % order
+        exponent = 1
+        for k in keys:
+            exponent = exponent * int(k) % order
+        return exponent
+    
+    def compute_public_key(self, private_key: int) -> int:
+        if self._g_windows is not None:
+            return self._fixed_base_pow(private_key % (self.p - 1))
+        if self.exp_table is None:
+            return self.modexp(self._g_mpz, private_key)
+        return self.exp_table[private_key % (self.p - 1)]
+
+
+class DHParticipant:
+    """
+    Participant dans l'échange Diffie-Hellman
+    """
+    __slots__ = ('name', 'dh', 'private_key', 'public_key', '_priv_mpz')
+    VERBOSE = False  # Affichage par défaut quand verbose n'est pas précisé
+    
+    def __init__(self, name: str, dh_instance: DiffieHellman, private_key: Optional[int] = None,
+                 public_key: Optional[int] = None, verbose: Optional[bool] = None):
+        self.name = name
+        self.dh = dh_instance
+        self.private_key = private_key if private_key is not None else self.dh.generate_private_key()
+        if public_key is None or private_key is None:
+            public_key = self.dh.compute_public_key(self.private_key)
+        self.public_key = public_key
+        # Clé convertie une fois pour GMP (réutilisée à chaque application)
+        self._priv_mpz = gmpy2.mpz(self.private_key) if gmpy2 is not None else self.private_key
+        
+        if self.VERBOSE if verbose is None else verbose:
+            print(f"{self.name}:")
+            print(f"  Clé privée: {self.private_key}")
+            print(f"  Clé publique: {self.public_key}")
+    
+    def apply_private_key(self, input_value: int) -> int:
+        """Applique la clé privée à une valeur"""
+        # dh et ses tables lus une seule fois ; le chemin table est déroulé ici plutôt que via fast_modexp
+        dh = self.dh
+        p = dh.p
+        x = input_value % p
+        # 1^a = 1, 0^a = 0 (a ≥ 1) et x^1 = x : aucune exponentiation
+        if x == 1 or self.private_key == 1 or (x == 0 and self.private_key > 0):
+            return x
+        exp_table = dh.exp_table
+        if exp_table is None:
+            # Clé secrète : exponentiation à temps constant, le motif de bits ne fuit pas par le timing
+            return dh.modexp_sec(x, self._priv_mpz)
+        if x == 0:
+            return dh.modexp(x, self.private_key)
+        return exp_table[dh.log_table[x] * self.private_key % (p - 1)]
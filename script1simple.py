@@ -5,6 +5,7 @@ class DiffieHellman:
     """
     Implémentation du protocole Diffie-Hellman classique pour 2 parties
     """
+    __slots__ = ('p', 'g', 'exp_table', 'log_table')
     
     def __init__(self, p: Optional[int] = None, g: Optional[int] = None):
         if p is None or g is None:
@@ -14,23 +15,54 @@ class DiffieHellman:
             self.p = p
             self.g = g
         
+        self.exp_table, self.log_table = self._build_tables()
+        
         print(f"Paramètres publics:")
         print(f"p = {self.p}, g = {self.g}\n")
     
+    def _build_tables(self):
+        """
+        Tables g^k mod p et logarithme discret (p petit, g générateur)
+        """
+        if self.p >= 1 << 20:
+            return None, None
+        order = self.p - 1
+        exp_table = [1] * order
+        log_table = [0] * self.p
+        v = 1
+        for k in range(1, order):
+            v = v * self.g % self.p
+            if v == 1:  # g n'est pas générateur : tables incomplètes
+                return None, None
+            exp_table[k] = v
+            log_table[v] = k
+        return exp_table, log_table
+    
+    def fast_modexp(self, x: int, k: int) -> int:
+        """
+        x^k mod p = g^(log(x) × k) : deux lectures de table au lieu d'une exponentiation
+        """
+        if self.exp_table is None or x % self.p == 0:
+            return pow(x, k, self.p)
+        return self.exp_table[self.log_table[x % self.p] * k % (self.p - 1)]
+    
     def generate_private_key(self) -> int:
         return random.randint(2, self.p - 2)
     
     def compute_public_key(self, private_key: int) -> int:
-        return pow(self.g, private_key, self.p)
+        if self.exp_table is None:
+            return pow(self.g, private_key, self.p)
+        return self.exp_table[private_key % (self.p - 1)]
     
     def compute_shared_secret(self, private_key: int, other_public_key: int) -> int:
-        return pow(other_public_key, private_key, self.p)
+        return self.fast_modexp(other_public_key, private_key)
 
 
 class DHParticipant:
     """
     Participant dans l'échange Diffie-Hellman
     """
+    __slots__ = ('name', 'dh', 'private_key', 'public_key')
     
     def __init__(self, name: str, dh_instance: DiffieHellman):
         self.name = name
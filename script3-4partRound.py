@@ -1,10 +1,13 @@
 import random
+import sys
+import numpy as np
 from typing import List, Optional
 
 class DiffieHellman:
     """
     Implémentation du protocole Diffie-Hellman
     """
+    __slots__ = ('p', 'g', 'exp_table', 'log_table')
     
     def __init__(self, p: Optional[int] = None, g: Optional[int] = None):
         if p is None or g is None:
@@ -14,20 +17,51 @@ class DiffieHellman:
             self.p = p
             self.g = g
         
+        self.exp_table, self.log_table = self._build_tables()
+        
         print(f"Paramètres publics:")
         print(f"p = {self.p}, g = {self.g}\n")
     
+    def _build_tables(self):
+        """
+        Tables g^k mod p et logarithme discret (p petit, g générateur)
+        """
+        if self.p >= 1 << 20:
+            return None, None
+        order = self.p - 1
+        exp_table = [1] * order
+        log_table = [0] * self.p
+        v = 1
+        for k in range(1, order):
+            v = v * self.g % self.p
+            if v == 1:  # g n'est pas générateur : tables incomplètes
+                return None, None
+            exp_table[k] = v
+            log_table[v] = k
+        return exp_table, log_table
+    
+    def fast_modexp(self, x: int, k: int) -> int:
+        """
+        x^k mod p = g^(log(x) × k) : deux lectures de table au lieu d'une exponentiation
+        """
+        if self.exp_table is None or x % self.p == 0:
+            return pow(x, k, self.p)
+        return self.exp_table[self.log_table[x % self.p] * k % (self.p - 1)]
+    
     def generate_private_key(self) -> int:
         return random.randint(2, self.p - 2)
     
     def compute_public_key(self, private_key: int) -> int:
-        return pow(self.g, private_key, self.p)
+        if self.exp_table is None:
+            return pow(self.g, private_key, self.p)
+        return self.exp_table[private_key % (self.p - 1)]
 
 
 class DHParticipant:
     """
     Participant dans l'échange Diffie-Hellman
     """
+    __slots__ = ('name', 'dh', 'private_key', 'public_key')
     
     def __init__(self, name: str, dh_instance: DiffieHellman):
         self.name = name
@@ -41,13 +75,14 @@ class DHParticipant:
     
     def apply_private_key(self, input_value: int) -> int:
         """Applique la clé privée à une valeur"""
-        return pow(input_value, self.private_key, self.dh.p)
+        return self.dh.fast_modexp(input_value, self.private_key)
 
 
 class CircularMultipartyDH:
     """
     Protocole Diffie-Hellman multipartite circulaire (par rounds)
     """
+    __slots__ = ('dh', 'participants')
     
     def __init__(self, dh_instance: DiffieHellman):
         self.dh = dh_instance
@@ -58,52 +93,75 @@ class CircularMultipartyDH:
         self.participants.append(participant)
         return participant
     
-    def run_protocol(self) -> int:
+    def run_protocol(self, verbose: bool = True) -> int:
         """
         Exécute le protocole circulaire par rounds
+        Sans affichage, le résultat g^(a1 × ... × an) est calculé directement
         """
+        if not verbose:
+            return self.compute_shared_secret()
+        
+        lines = []  # Sortie regroupée : une seule écriture sur stdout
         n = len(self.participants)
-        print(f"Protocole circulaire - {n} participants")
-        print(f"Nombre de rounds nécessaires: {n-1}\n")
+        lines.append(f"Protocole circulaire - {n} participants")
+        lines.append(f"Nombre de rounds nécessaires: {n-1}\n")
         
         # Round 0: Clés publiques initiales
         current_values = []
-        print("Round 0 - Clés publiques:")
+        lines.append("Round 0 - Clés publiques:")
         for participant in self.participants:
             current_values.append(participant.public_key)
-            print(f"  {participant.name}: g^{participant.private_key} = {participant.public_key}")
-        print(f"  Valeurs: {current_values}\n")
+            lines.append(f"  {participant.name}: g^{participant.private_key} = {participant.public_key}")
+        lines.append(f"  Valeurs: {current_values}\n")
+        
+        # Tables NumPy : un round entier = lecture log, multiplication, lecture exp
+        use_tables = self.dh.exp_table is not None
+        if use_tables:
+            exp_table = np.asarray(self.dh.exp_table, dtype=np.int64)
+            log_table = np.asarray(self.dh.log_table, dtype=np.int64)
+            keys = np.array([participant.private_key for participant in self.participants], dtype=np.int64)
         
         # Rounds 1 à n-1: Circulation
         for round_num in range(1, n):
-            print(f"Round {round_num}:")
-            new_values = []
+            lines.append(f"Round {round_num}:")
+            # Chaque participant prend la valeur du participant précédent (circulation)
+            input_values = current_values[-1:] + current_values[:-1]
+            
+            # Applique les clés privées de tous les participants en une fois
+            if use_tables:
+                new_values = exp_table[log_table[input_values] * keys % (self.dh.p - 1)].tolist()
+            else:
+                new_values = [participant.apply_private_key(value)
+                              for participant, value in zip(self.participants, input_values)]
             
             for i, participant in enumerate(self.participants):
-                # Prend la valeur du participant précédent (circulation)
-                prev_index = (i - 1) % n
-                input_value = current_values[prev_index]
-                sender = self.participants[prev_index].name
-                
-                # Applique sa clé privée
-                output_value = participant.apply_private_key(input_value)
-                new_values.append(output_value)
-                
-                print(f"  {participant.name} ← {sender}: {input_value}^{participant.private_key} = {output_value}")
+                sender = self.participants[i - 1].name
+                lines.append(f"  {participant.name} ← {sender}: {input_values[i]}^{participant.private_key} = {new_values[i]}")
             
             current_values = new_values
-            print(f"  Valeurs: {current_values}\n")
+            lines.append(f"  Valeurs: {current_values}\n")
         
         # Vérification finale
         final_secret = current_values[0]
         all_same = all(value == final_secret for value in current_values)
         
-        print("Résultat final:")
-        print(f"  Valeurs finales: {current_values}")
-        print(f"  Tous identiques: {'Oui' if all_same else 'Non'}")
-        print(f"  Secret partagé: {final_secret}")
+        lines.append("Résultat final:")
+        lines.append(f"  Valeurs finales: {current_values}")
+        lines.append(f"  Tous identiques: {'Oui' if all_same else 'Non'}")
+        lines.append(f"  Secret partagé: {final_secret}")
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return final_secret if all_same else None
+    
+    def compute_shared_secret(self) -> int:
+        """
+        Secret final sans les rounds : produit des clés mod (p-1), puis une seule exponentiation
+        """
+        order = self.dh.p - 1  # g^(p-1) = 1 (Fermat) : l'exposant se réduit mod p-1
+        exponent = 1
+        for participant in self.participants:
+            exponent = exponent * participant.private_key % order
+        return self.dh.compute_public_key(exponent)
 
 
 def main():
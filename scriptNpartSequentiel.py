@@ -1,82 +1,78 @@
-import random
+import sys
+import numpy as np
 from typing import List, Optional
 
-class DiffieHellman:
-    """
-    Implémentation du protocole Diffie-Hellman
-    """
-    
-    def __init__(self, p: Optional[int] = None, g: Optional[int] = None):
-        if p is None or g is None:
-            self.p = 2357  # Nombre premier
-            self.g = 2     # Générateur primitif modulo p
-        else:
-            self.p = p
-            self.g = g
-        
-        print(f"Paramètres publics:")
-        print(f"p = {self.p}, g = {self.g}\n")
-    
-    def generate_private_key(self) -> int:
-        return random.randint(2, self.p - 2)
-    
-    def compute_public_key(self, private_key: int) -> int:
-        return pow(self.g, private_key, self.p)
-
-
-class DHParticipant:
-    """
-    Participant dans l'échange Diffie-Hellman
-    """
-    
-    def __init__(self, name: str, dh_instance: DiffieHellman):
-        self.name = name
-        self.dh = dh_instance
-        self.private_key = self.dh.generate_private_key()
-        self.public_key = self.dh.compute_public_key(self.private_key)
-        
-        print(f"{self.name}:")
-        print(f"  Clé privée: {self.private_key}")
-        print(f"  Clé publique: {self.public_key}")
-    
-    def apply_private_key(self, input_value: int) -> int:
-        """Applique la clé privée à une valeur"""
-        return pow(input_value, self.private_key, self.dh.p)
+from dh_core import DiffieHellman, DHParticipant
 
 
 class MultipartyDH:
     """
     Protocole Diffie-Hellman multipartite séquentiel
     """
+    __slots__ = ('dh', 'participants', 'keys')
     
     def __init__(self, dh_instance: DiffieHellman):
         self.dh = dh_instance
         self.participants = []
+        self.keys = None  # Clés privées en tableau (SoA), None si ajoutées une à une
     
-    def add_participant(self, name: str) -> DHParticipant:
-        participant = DHParticipant(name, self.dh)
+    def add_participant(self, name: str, verbose: Optional[bool] = None) -> DHParticipant:
+        participant = DHParticipant(name, self.dh, verbose=verbose)
         self.participants.append(participant)
+        self.keys = None
         return participant
     
-    def run_protocol(self) -> int:
+    def add_participants(self, names: List[str], verbose: Optional[bool] = None) -> List[DHParticipant]:
+        """
+        Ajoute plusieurs participants : clés privées tirées par le CSPRNG du système, rangées en un tableau
+        """
+        keys = self.dh.generate_private_keys(len(names))
+        if keys is None:  # p dépasse 63 bits : clés tirées une à une
+            added = [DHParticipant(name, self.dh, verbose=verbose) for name in names]
+            self.keys = None
+        else:
+            pubs = self.dh.compute_public_keys(keys)  # Clés publiques calculées en lot
+            added = [DHParticipant(name, self.dh, int(k), int(pub), verbose=verbose)
+                     for name, k, pub in zip(names, keys, pubs)]
+            if not self.participants:
+                self.keys = keys
+            elif self.keys is not None:
+                self.keys = np.concatenate((self.keys, keys))
+        self.participants.extend(added)
+        return added
+    
+    def run_protocol(self, verbose: bool = False) -> int:
         """
         Exécute le protocole séquentiel
         Calcule: g^(a1 × a2 × a3 × ... × an) mod p
+        Sans affichage, le résultat est calculé directement en une exponentiation
         """
-        n = len(self.participants)
-        print(f"Protocole multipartite - {n} participants")
-        print(f"Calcul: g^(a1 × a2 × ... × a{n}) mod p\n")
+        if not verbose:
+            return self.compute_shared_secret()
         
         current_value = self.dh.g
-        print(f"Valeur initiale: g = {current_value}")
+        lines = []  # Sortie regroupée : une seule écriture sur stdout
+        n = len(self.participants)
+        lines.append(f"Protocole multipartite - {n} participants")
+        lines.append(f"Calcul: g^(a1 × a2 × ... × a{n}) mod p\n")
+        
+        lines.append(f"Valeur initiale: g = {current_value}")
         
         for i, participant in enumerate(self.participants):
             new_value = participant.apply_private_key(current_value)
-            print(f"Étape {i+1} - {participant.name}: {current_value}^{participant.private_key} = {new_value}")
+            lines.append(f"Étape {i+1} - {participant.name}: {current_value}^{participant.private_key} = {new_value}")
             current_value = new_value
         
-        print(f"\nSecret partagé: {current_value}")
+        lines.append(f"\nSecret partagé: {current_value}")
+        sys.stdout.write("\n".join(lines) + "\n")
         return current_value
+    
+    def compute_shared_secret(self) -> int:
+        """
+        Secret final sans la chaîne : produit des clés mod (p-1), puis une seule exponentiation
+        """
+        keys = self.keys if self.keys is not None else [participant.private_key for participant in self.participants]
+        return self.dh.compute_public_key(self.dh.fold_private_keys(keys))
 
 
 def multiparty_example():
@@ -86,24 +82,16 @@ def multiparty_example():
     print("=== DIFFIE-HELLMAN MULTIPARTITE ===\n")
     
     # Initialisation
-    dh = DiffieHellman()
+    dh = DiffieHellman(verbose=True)
     multiparty = MultipartyDH(dh)
     
     # Ajout des participants
-    multiparty.add_participant("Alice")
-    multiparty.add_participant("Bob")
-    multiparty.add_participant("Charlie")
-    multiparty.add_participant("David")
-    multiparty.add_participant("Eve")
-    multiparty.add_participant("Mallory")
-    multiparty.add_participant("Trent")
-    multiparty.add_participant("Wendy")
-    multiparty.add_participant("Xavier")
-    multiparty.add_participant("Yves")
+    multiparty.add_participants(["Alice", "Bob", "Charlie", "David", "Eve",
+                                 "Mallory", "Trent", "Wendy", "Xavier", "Yves"], verbose=True)
     print()
     
     # Exécution du protocole
-    secret = multiparty.run_protocol()
+    secret = multiparty.run_protocol(verbose=True)
     
     return secret
 